@@ -15,12 +15,16 @@
 package app
 
 import (
+	"crypto/sha256"
+	"encoding/hex"
 	"encoding/json"
 	"errors"
 	"fmt"
 	"log"
 	"net/http"
 	"strconv"
+	"strings"
+	"time"
 
 	apiv1 "cloud-android-orchestration/api/v1"
 
@@ -31,22 +35,44 @@ import (
 // and validates requests from the client and passes the information to the
 // relevant modules
 type Controller struct {
-	infraConfig     apiv1.InfraConfig
+	infraConfig     *staticJSONResponse
 	instanceManager InstanceManager
 	sigServer       SignalingServer
 	accountManager  AccountManager
 }
 
 func NewController(servers []string, im InstanceManager, ss SignalingServer, am AccountManager) *Controller {
-	infraCfg := buildInfraCfg(servers)
+	infraCfg, err := newStaticJSONResponse(buildInfraCfg(servers))
+	if err != nil {
+		// Can't happen, the infra config only contains strings
+		panic(fmt.Sprintf("Failed to encode infra config: %v", err))
+	}
 	controller := &Controller{infraCfg, im, ss, am}
 	controller.SetupRoutes()
 
 	return controller
 }
 
+const (
+	// Bounds the time a client may take to send the request headers, so slow or
+	// idle clients can't hold on to server resources indefinitely.
+	serverReadHeaderTimeout = 10 * time.Second
+	// How long keep-alive connections are kept open waiting for the next
+	// request. The signaling endpoints are polled, so connections are reused
+	// often.
+	serverIdleTimeout = 120 * time.Second
+)
+
 func (c *Controller) ListenAndServe(addr string, handler http.Handler) error {
-	return http.ListenAndServe(addr, handler)
+	// No read or write timeouts are set on purpose: device files are proxied and
+	// may take arbitrarily long to transfer.
+	server := &http.Server{
+		Addr:              addr,
+		Handler:           handler,
+		ReadHeaderTimeout: serverReadHeaderTimeout,
+		IdleTimeout:       serverIdleTimeout,
+	}
+	return server.ListenAndServe()
 }
 
 func (c *Controller) SetupRoutes() {
@@ -63,10 +89,8 @@ func (c *Controller) SetupRoutes() {
 	router.Handle("/v1/zones/{zone}/hosts", HTTPHandler(c.accountManager.Authenticate(c.ListHosts))).Methods("GET")
 
 	// Infra route
-	router.HandleFunc("/v1/zones/{zone}/hosts/{host}/infra_config", func(w http.ResponseWriter, r *http.Request) {
-		// TODO(b/220891296): Make this configurable
-		replyJSON(w, c.infraConfig, http.StatusOK)
-	}).Methods("GET")
+	// TODO(b/220891296): Make this configurable
+	router.Handle("/v1/zones/{zone}/hosts/{host}/infra_config", c.infraConfig).Methods("GET")
 
 	// Global routes
 	router.Handle("/", HTTPHandler(c.accountManager.Authenticate(indexHandler)))
@@ -228,16 +252,79 @@ func intFormValue(r *http.Request, name string, def int) (int, error) {
 	return i, nil
 }
 
+// Assigned directly to the header map to avoid canonicalizing the key and
+// allocating a new value slice on every response.
+var jsonContentType = []string{"application/json"}
+
 // Send a JSON http response to the client
 func replyJSON(w http.ResponseWriter, obj interface{}, statusCode int) error {
+	// Headers set after the status code is written are ignored
+	w.Header()["Content-Type"] = jsonContentType
 	if statusCode != http.StatusOK {
 		w.WriteHeader(statusCode)
 	}
-	w.Header().Set("Content-Type", "application/json")
+	if raw, ok := obj.(json.RawMessage); ok {
+		return writeRawJSON(w, raw)
+	}
 	encoder := json.NewEncoder(w)
 	return encoder.Encode(obj)
 }
 
+// Writes JSON that is already encoded, like replies from the host orchestrator,
+// without running it through the encoder again. Unlike json.Encoder, the input
+// is written as is: it's neither compacted nor HTML escaped.
+func writeRawJSON(w http.ResponseWriter, raw json.RawMessage) error {
+	if raw == nil {
+		raw = json.RawMessage("null")
+	}
+	if _, err := w.Write(raw); err != nil {
+		return err
+	}
+	_, err := w.Write([]byte{'\n'})
+	return err
+}
+
+// A JSON response that never changes. It's encoded only once and carries an
+// ETag so clients can revalidate their copy without downloading it again.
+type staticJSONResponse struct {
+	body []byte
+	etag string
+}
+
+func newStaticJSONResponse(obj interface{}) (*staticJSONResponse, error) {
+	body, err := json.Marshal(obj)
+	if err != nil {
+		return nil, err
+	}
+	// Match the output of replyJSON
+	body = append(body, '\n')
+	sum := sha256.Sum256(body)
+	etag := `"` + hex.EncodeToString(sum[:16]) + `"`
+	return &staticJSONResponse{body, etag}, nil
+}
+
+func (s *staticJSONResponse) ServeHTTP(w http.ResponseWriter, r *http.Request) {
+	w.Header()["Content-Type"] = jsonContentType
+	w.Header().Set("ETag", s.etag)
+	if etagMatches(r.Header.Get("If-None-Match"), s.etag) {
+		w.WriteHeader(http.StatusNotModified)
+		return
+	}
+	w.Write(s.body)
+}
+
+// Whether the value of an If-None-Match header matches the given entity tag.
+// Weak comparison is used, as specified for If-None-Match.
+func etagMatches(ifNoneMatch string, etag string) bool {
+	for _, t := range strings.Split(ifNoneMatch, ",") {
+		t = strings.TrimSpace(t)
+		if t == "*" || strings.TrimPrefix(t, "W/") == etag {
+			return true
+		}
+	}
+	return false
+}
+
 func getZone(r *http.Request) string {
 	return mux.Vars(r)["zone"]
 }
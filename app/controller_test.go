@@ -15,9 +15,13 @@
 package app
 
 import (
+	"encoding/json"
 	"errors"
 	"net/http"
+	"net/http/httptest"
 	"testing"
+
+	apiv1 "cloud-android-orchestration/api/v1"
 )
 
 func TestBuildListHostsRequest(t *testing.T) {
@@ -72,6 +76,90 @@ func TestBuildListHostsRequest(t *testing.T) {
 	})
 }
 
+func TestReplyJSONSetsContentType(t *testing.T) {
+	for _, status := range []int{http.StatusOK, http.StatusNotFound} {
+		w := httptest.NewRecorder()
+
+		replyJSON(w, apiv1.ErrorMsg{Error: "foo"}, status)
+
+		if w.Code != status {
+			t.Errorf("expected <<%d>>, got %d", status, w.Code)
+		}
+		if ct := w.Result().Header.Get("Content-Type"); ct != "application/json" {
+			t.Errorf("expected <<%q>>, got %q", "application/json", ct)
+		}
+	}
+}
+
+func TestReplyJSONRawMessage(t *testing.T) {
+	var tests = []struct {
+		raw      json.RawMessage
+		expected string
+	}{
+		{json.RawMessage(`{"foo":[1,2]}`), "{\"foo\":[1,2]}\n"},
+		{nil, "null\n"},
+	}
+	for _, tt := range tests {
+		w := httptest.NewRecorder()
+
+		replyJSON(w, tt.raw, http.StatusOK)
+
+		if w.Body.String() != tt.expected {
+			t.Errorf("expected <<%q>>, got %q", tt.expected, w.Body.String())
+		}
+	}
+}
+
+func TestStaticJSONResponse(t *testing.T) {
+	res, err := newStaticJSONResponse(apiv1.ErrorMsg{Error: "foo"})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	r, _ := http.NewRequest("GET", "http://abc.com/", nil)
+	w := httptest.NewRecorder()
+
+	res.ServeHTTP(w, r)
+
+	if w.Code != http.StatusOK {
+		t.Errorf("expected <<%d>>, got %d", http.StatusOK, w.Code)
+	}
+	expected := "{\"error\":\"foo\"}\n"
+	if w.Body.String() != expected {
+		t.Errorf("expected <<%q>>, got %q", expected, w.Body.String())
+	}
+	if w.Header().Get("ETag") == "" {
+		t.Errorf("expected an ETag header")
+	}
+}
+
+func TestStaticJSONResponseNotModified(t *testing.T) {
+	res, err := newStaticJSONResponse(apiv1.ErrorMsg{Error: "foo"})
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	var tests = []struct {
+		ifNoneMatch string
+		status      int
+	}{
+		{res.etag, http.StatusNotModified},
+		{"W/" + res.etag, http.StatusNotModified},
+		{"\"bar\", " + res.etag, http.StatusNotModified},
+		{"*", http.StatusNotModified},
+		{"\"bar\"", http.StatusOK},
+	}
+	for _, tt := range tests {
+		r, _ := http.NewRequest("GET", "http://abc.com/", nil)
+		r.Header.Set("If-None-Match", tt.ifNoneMatch)
+		w := httptest.NewRecorder()
+
+		res.ServeHTTP(w, r)
+
+		if w.Code != tt.status {
+			t.Errorf("If-None-Match %q: expected <<%d>>, got %d", tt.ifNoneMatch, tt.status, w.Code)
+		}
+	}
+}
+
 func assertIsAppError(t *testing.T, err error) {
 	var appErr *AppError
 	if !errors.As(err, &appErr) {
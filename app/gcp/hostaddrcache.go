@@ -0,0 +1,121 @@
+// Copyright 2022 Google LLC
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     https://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+package gcp
+
+import (
+	"errors"
+	"sync"
+	"time"
+)
+
+const (
+	// The internal address of a host doesn't change while the instance exists,
+	// a short lifetime only bounds how long a deleted host is still resolved.
+	hostAddrCacheTTL        = 30 * time.Second
+	hostAddrCacheMaxEntries = 1024
+)
+
+type hostAddrKey struct {
+	zone string
+	host string
+}
+
+type hostAddrEntry struct {
+	addr    string
+	expires time.Time
+}
+
+// Caches host addresses to avoid a call to the compute API on every signaling
+// request, clients poll for messages several times per second. Concurrent
+// lookups of an address that isn't cached share a single call. The zero value
+// is an empty cache ready to use.
+type hostAddrCache struct {
+	mu       sync.Mutex
+	entries  map[hostAddrKey]hostAddrEntry
+	inflight map[hostAddrKey]*hostAddrCall
+}
+
+// A lookup in progress, other callers wait for it to finish instead of
+// starting their own.
+type hostAddrCall struct {
+	done chan struct{}
+	addr string
+	err  error
+	// The number of callers waiting on this lookup.
+	dups int
+}
+
+var errHostAddrFetchPanicked = errors.New("host address lookup panicked")
+
+// Returns the cached address of the host or the one returned by fetch if there
+// is no valid cached address. Errors are not cached, but are returned to all
+// callers waiting on the failed lookup.
+func (c *hostAddrCache) get(zone string, host string, fetch func() (string, error)) (string, error) {
+	key := hostAddrKey{zone, host}
+	c.mu.Lock()
+	if entry, ok := c.entries[key]; ok && time.Now().Before(entry.expires) {
+		c.mu.Unlock()
+		return entry.addr, nil
+	}
+	if call, ok := c.inflight[key]; ok {
+		call.dups++
+		c.mu.Unlock()
+		<-call.done
+		return call.addr, call.err
+	}
+	call := &hostAddrCall{done: make(chan struct{})}
+	if c.inflight == nil {
+		c.inflight = make(map[hostAddrKey]*hostAddrCall)
+	}
+	c.inflight[key] = call
+	c.mu.Unlock()
+
+	returned := false
+	// Deferred so that waiting callers are released even if fetch panics,
+	// otherwise they and any later lookups of the host would block forever.
+	defer func() {
+		c.mu.Lock()
+		delete(c.inflight, key)
+		if !returned {
+			call.err = errHostAddrFetchPanicked
+		} else if call.err == nil {
+			c.put(key, call.addr)
+		}
+		c.mu.Unlock()
+		close(call.done)
+	}()
+	call.addr, call.err = fetch()
+	returned = true
+	return call.addr, call.err
+}
+
+// Must be called with the lock held.
+func (c *hostAddrCache) put(key hostAddrKey, addr string) {
+	if c.entries == nil {
+		c.entries = make(map[hostAddrKey]hostAddrEntry)
+	}
+	now := time.Now()
+	if len(c.entries) >= hostAddrCacheMaxEntries {
+		for k, e := range c.entries {
+			if !now.Before(e.expires) {
+				delete(c.entries, k)
+			}
+		}
+		if len(c.entries) >= hostAddrCacheMaxEntries {
+			c.entries = make(map[hostAddrKey]hostAddrEntry)
+		}
+	}
+	c.entries[key] = hostAddrEntry{addr: addr, expires: now.Add(hostAddrCacheTTL)}
+}
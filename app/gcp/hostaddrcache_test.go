@@ -0,0 +1,163 @@
+// Copyright 2022 Google LLC
+//
+// Licensed under the Apache License, Version 2.0 (the "License");
+// you may not use this file except in compliance with the License.
+// You may obtain a copy of the License at
+//
+//     https://www.apache.org/licenses/LICENSE-2.0
+//
+// Unless required by applicable law or agreed to in writing, software
+// distributed under the License is distributed on an "AS IS" BASIS,
+// WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+// See the License for the specific language governing permissions and
+// limitations under the License.
+
+package gcp
+
+import (
+	"errors"
+	"testing"
+	"time"
+)
+
+func TestHostAddrCacheHit(t *testing.T) {
+	var c hostAddrCache
+	calls := 0
+	fetch := func() (string, error) {
+		calls++
+		return "10.128.0.63", nil
+	}
+
+	c.get("us-central1-a", "foo", fetch)
+	addr, _ := c.get("us-central1-a", "foo", fetch)
+
+	if addr != "10.128.0.63" {
+		t.Errorf("unexpected host address <<%q>>, want: %q", addr, "10.128.0.63")
+	}
+	if calls != 1 {
+		t.Errorf("expected <<%d>> fetch calls, got %d", 1, calls)
+	}
+}
+
+func TestHostAddrCacheKeyedByZoneAndHost(t *testing.T) {
+	var c hostAddrCache
+	calls := 0
+	fetch := func() (string, error) {
+		calls++
+		return "10.128.0.63", nil
+	}
+
+	c.get("us-central1-a", "foo", fetch)
+	c.get("us-central1-b", "foo", fetch)
+	c.get("us-central1-a", "bar", fetch)
+
+	if calls != 3 {
+		t.Errorf("expected <<%d>> fetch calls, got %d", 3, calls)
+	}
+}
+
+func TestHostAddrCacheExpiredEntry(t *testing.T) {
+	var c hostAddrCache
+	c.entries = make(map[hostAddrKey]hostAddrEntry)
+	c.entries[hostAddrKey{"us-central1-a", "foo"}] = hostAddrEntry{"10.128.0.63", time.Now().Add(-time.Second)}
+
+	addr, _ := c.get("us-central1-a", "foo", func() (string, error) { return "10.128.0.64", nil })
+
+	if addr != "10.128.0.64" {
+		t.Errorf("unexpected host address <<%q>>, want: %q", addr, "10.128.0.64")
+	}
+}
+
+func TestHostAddrCacheErrorsAreNotCached(t *testing.T) {
+	var c hostAddrCache
+	expectedErr := errors.New("foo")
+
+	_, err := c.get("us-central1-a", "foo", func() (string, error) { return "", expectedErr })
+	addr, _ := c.get("us-central1-a", "foo", func() (string, error) { return "10.128.0.63", nil })
+
+	if err != expectedErr {
+		t.Errorf("unexpected error <<%v>>, want: %v", err, expectedErr)
+	}
+	if addr != "10.128.0.63" {
+		t.Errorf("unexpected host address <<%q>>, want: %q", addr, "10.128.0.63")
+	}
+}
+
+func TestHostAddrCacheConcurrentLookupsShareFetch(t *testing.T) {
+	var c hostAddrCache
+	started := make(chan struct{})
+	release := make(chan struct{})
+	go c.get("us-central1-a", "foo", func() (string, error) {
+		close(started)
+		<-release
+		return "10.128.0.63", nil
+	})
+	<-started
+	calls := 0
+	result := make(chan string)
+
+	go func() {
+		addr, _ := c.get("us-central1-a", "foo", func() (string, error) {
+			calls++
+			return "10.128.0.64", nil
+		})
+		result <- addr
+	}()
+	waitForDups(&c, hostAddrKey{"us-central1-a", "foo"}, 1)
+	close(release)
+	addr := <-result
+
+	if addr != "10.128.0.63" {
+		t.Errorf("unexpected host address <<%q>>, want: %q", addr, "10.128.0.63")
+	}
+	if calls != 0 {
+		t.Errorf("expected <<%d>> fetch calls, got %d", 0, calls)
+	}
+}
+
+func TestHostAddrCacheFetchPanics(t *testing.T) {
+	var c hostAddrCache
+	started := make(chan struct{})
+	release := make(chan struct{})
+	go func() {
+		defer func() { recover() }()
+		c.get("us-central1-a", "foo", func() (string, error) {
+			close(started)
+			<-release
+			panic("foo")
+		})
+	}()
+	<-started
+	waitErr := make(chan error)
+
+	go func() {
+		_, err := c.get("us-central1-a", "foo", func() (string, error) { return "10.128.0.64", nil })
+		waitErr <- err
+	}()
+	waitForDups(&c, hostAddrKey{"us-central1-a", "foo"}, 1)
+	close(release)
+	err := <-waitErr
+	addr, _ := c.get("us-central1-a", "foo", func() (string, error) { return "10.128.0.63", nil })
+
+	if err != errHostAddrFetchPanicked {
+		t.Errorf("unexpected error <<%v>>, want: %v", err, errHostAddrFetchPanicked)
+	}
+	if addr != "10.128.0.63" {
+		t.Errorf("unexpected host address <<%q>>, want: %q", addr, "10.128.0.63")
+	}
+}
+
+// Waits until the given number of callers are waiting on the lookup in progress
+// for the key.
+func waitForDups(c *hostAddrCache, key hostAddrKey, dups int) {
+	for {
+		c.mu.Lock()
+		call, ok := c.inflight[key]
+		done := ok && call.dups >= dups
+		c.mu.Unlock()
+		if done {
+			return
+		}
+		time.Sleep(time.Millisecond)
+	}
+}
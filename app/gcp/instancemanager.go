@@ -23,6 +23,7 @@ import (
 	"cloud-android-orchestration/app"
 
 	"google.golang.org/api/compute/v1"
+	"google.golang.org/api/googleapi"
 )
 
 const (
@@ -36,9 +37,16 @@ type InstanceManager struct {
 	Config                app.IMConfig
 	Service               *compute.Service
 	InstanceNameGenerator NameGenerator
+	hostAddrs             hostAddrCache
 }
 
 func (m *InstanceManager) GetHostAddr(zone string, host string) (string, error) {
+	return m.hostAddrs.get(zone, host, func() (string, error) {
+		return m.fetchHostAddr(zone, host)
+	})
+}
+
+func (m *InstanceManager) fetchHostAddr(zone string, host string) (string, error) {
 	instance, err := m.getHostInstance(zone, host)
 	if err != nil {
 		return "", err
@@ -106,6 +114,13 @@ func (m *InstanceManager) CreateHost(zone string, req *apiv1.CreateHostRequest,
 
 const listHostsRequestMaxResultsLimit uint32 = 500
 
+// Only the instance fields used by BuildHostInstance are requested, the full
+// instance resources are much larger.
+var listHostsFields = []googleapi.Field{
+	"nextPageToken",
+	"items(name,selfLink,machineType,minCpuPlatform,disks/diskSizeGb)",
+}
+
 func (m *InstanceManager) ListHosts(zone string, user app.UserInfo, req *app.ListHostsRequest) (*apiv1.ListHostsResponse, error) {
 	var maxResults uint32
 	if req.MaxResults <= listHostsRequestMaxResultsLimit {
@@ -119,11 +134,12 @@ func (m *InstanceManager) ListHosts(zone string, user app.UserInfo, req *app.Lis
 		MaxResults(int64(maxResults)).
 		PageToken(req.PageToken).
 		Filter("labels.cf-created_by:" + user.Username()).
+		Fields(listHostsFields...).
 		Do()
 	if err != nil {
 		return nil, err
 	}
-	var items []*apiv1.HostInstance
+	items := make([]*apiv1.HostInstance, 0, len(res.Items))
 	for _, i := range res.Items {
 		hi, err := BuildHostInstance(i)
 		if err != nil {
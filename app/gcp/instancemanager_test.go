@@ -294,6 +294,35 @@ func TestGetHostAddrSuccess(t *testing.T) {
 	}
 }
 
+func TestGetHostAddrIsCached(t *testing.T) {
+	requests := 0
+	ts := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		requests++
+		i := &compute.Instance{
+			NetworkInterfaces: []*compute.NetworkInterface{
+				{
+					NetworkIP: "10.128.0.63",
+				},
+			},
+		}
+		replyJSON(w, i)
+	}))
+	defer ts.Close()
+	testService := buildTestService(t, ts)
+	im := InstanceManager{
+		Config:                testConfig,
+		Service:               testService,
+		InstanceNameGenerator: testNameGenerator,
+	}
+
+	im.GetHostAddr("us-central1-a", "foo")
+	im.GetHostAddr("us-central1-a", "foo")
+
+	if requests != 1 {
+		t.Errorf("expected <<%d>> requests, got %d", 1, requests)
+	}
+}
+
 func TestListHostsRequestQuery(t *testing.T) {
 	var usedQuery string
 	ts := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
@@ -314,7 +343,7 @@ func TestListHostsRequestQuery(t *testing.T) {
 
 	im.ListHosts("us-central1-a", &TestUserInfo{}, req)
 
-	expected := "alt=json&filter=labels.cf-created_by%3Ajohndoe&maxResults=100&pageToken=foo&prettyPrint=false"
+	expected := "alt=json&fields=nextPageToken%2Citems%28name%2CselfLink%2CmachineType%2CminCpuPlatform%2Cdisks%2FdiskSizeGb%29&filter=labels.cf-created_by%3Ajohndoe&maxResults=100&pageToken=foo&prettyPrint=false"
 	if usedQuery != expected {
 		t.Errorf("expected <<%q>>, got %q", expected, usedQuery)
 	}
@@ -340,7 +369,7 @@ func TestListHostsOverMaxResultsLimit(t *testing.T) {
 
 	im.ListHosts("us-central1-a", &TestUserInfo{}, req)
 
-	expected := "alt=json&filter=labels.cf-created_by%3Ajohndoe&maxResults=500&pageToken=foo&prettyPrint=false"
+	expected := "alt=json&fields=nextPageToken%2Citems%28name%2CselfLink%2CmachineType%2CminCpuPlatform%2Cdisks%2FdiskSizeGb%29&filter=labels.cf-created_by%3Ajohndoe&maxResults=500&pageToken=foo&prettyPrint=false"
 	if usedQuery != expected {
 		t.Errorf("expected <<%q>>, got %q", expected, usedQuery)
 	}
@@ -19,10 +19,11 @@ import (
 	"encoding/base64"
 	"encoding/json"
 	"fmt"
+	"io"
 	"log"
 	"net/http"
 	"net/http/httputil"
-	"net/url"
+	"strconv"
 	"strings"
 
 	apiv1 "cloud-android-orchestration/api/v1"
@@ -33,10 +34,30 @@ import (
 // forwarding all requests to it.
 type ForwardingSignalingServer struct {
 	instanceManager InstanceManager
+	// The port the host orchestrators listen on, in the form ":port".
+	hostPort string
+}
+
+const defaultHostOrchestratorPort = ":1080"
+
+const hostMaxIdleConnsPerHost = 50
+
+// Shared by all requests to the host orchestrators so that connections to them
+// are pooled and reused instead of being established for every request.
+var hostTransport = newHostTransport()
+
+var hostClient = &http.Client{Transport: hostTransport}
+
+func newHostTransport() *http.Transport {
+	t := http.DefaultTransport.(*http.Transport).Clone()
+	// The default of 2 idle connections per host is too low for the number of
+	// concurrent polling clients a single host usually has.
+	t.MaxIdleConnsPerHost = hostMaxIdleConnsPerHost
+	return t
 }
 
 func NewForwardingSignalingServer(im InstanceManager) *ForwardingSignalingServer {
-	return &ForwardingSignalingServer{im}
+	return &ForwardingSignalingServer{im, defaultHostOrchestratorPort}
 }
 
 func (s *ForwardingSignalingServer) NewConnection(zone string, host string, msg apiv1.NewConnMsg, user UserInfo) (*apiv1.SServerResponse, error) {
@@ -46,7 +67,7 @@ func (s *ForwardingSignalingServer) NewConnection(zone string, host string, msg
 	}
 	var resErr apiv1.ErrorMsg
 	var reply apiv1.NewConnReply
-	status, err := POSTRequest(hostURL(hostAddr, "/polled_connections", ""), apiv1.NewConnMsg{msg.DeviceId}, &reply, &resErr)
+	status, err := POSTRequest(s.hostURL(hostAddr, "/polled_connections", ""), apiv1.NewConnMsg{msg.DeviceId}, &reply, &resErr)
 	if err != nil {
 		return nil, err
 	}
@@ -70,8 +91,9 @@ func (s *ForwardingSignalingServer) Forward(zone string, host string, id string,
 		return nil, err
 	}
 	var resErr apiv1.ErrorMsg
-	var reply interface{}
-	status, err := POSTRequest(hostURL(hostAddr, "/polled_connections/"+connId+"/:forward", ""), msg, &reply, &resErr)
+	// The reply is passed through to the client as is, there is no need to decode it
+	var reply json.RawMessage
+	status, err := POSTRequest(s.hostURL(hostAddr, "/polled_connections/"+connId+"/:forward", ""), msg, &reply, &resErr)
 	if err != nil {
 		return nil, err
 	}
@@ -88,13 +110,14 @@ func (s *ForwardingSignalingServer) Messages(zone string, host string, id string
 	if err != nil {
 		return nil, err
 	}
-	query := fmt.Sprintf("start=%d", start)
+	query := "start=" + strconv.Itoa(start)
 	if count > 0 {
-		query = fmt.Sprintf("%s&count=%d", query, count)
+		query += "&count=" + strconv.Itoa(count)
 	}
 	var resErr apiv1.ErrorMsg
-	var reply interface{}
-	status, err := GETRequest(hostURL(hostAddr, "/polled_connections/"+connId+"/messages", query), &reply, &resErr)
+	// The reply is passed through to the client as is, there is no need to decode it
+	var reply json.RawMessage
+	status, err := GETRequest(s.hostURL(hostAddr, "/polled_connections/"+connId+"/messages", query), &reply, &resErr)
 	if err != nil {
 		return nil, err
 	}
@@ -106,23 +129,36 @@ func (s *ForwardingSignalingServer) ServeDeviceFiles(zone string, host string, p
 	if err != nil {
 		return err
 	}
-	if shouldIntercept(params.path) {
-		http.ServeFile(params.w, params.r, fmt.Sprintf("intercept%s", params.path))
+	if localPath, ok := interceptedFile(params.path); ok {
+		params.w.Header().Set("Cache-Control", interceptedFilesCacheControl)
+		http.ServeFile(params.w, params.r, localPath)
 	} else {
-		devUrl, err := url.Parse(hostURL(hostAddr, "", ""))
-		if err != nil {
-			return err
+		if params.path == deviceClientPage {
+			params.w.Header()["Link"] = deviceClientPagePreloads
 		}
-		devProxy := httputil.NewSingleHostReverseProxy(devUrl)
-
-		params.r.URL.Path = fmt.Sprintf("/devices/%s/files%s", params.devId, params.path)
-		devProxy.ServeHTTP(params.w, params.r)
+		params.r.URL.Scheme = "http"
+		params.r.URL.Host = hostAddr + s.hostPort
+		params.r.URL.Path = "/devices/" + params.devId + "/files" + params.path
+		deviceFilesProxy.ServeHTTP(params.w, params.r)
 	}
 	return nil
 }
 
-func hostURL(addr string, path string, query string) string {
-	url := "http://" + addr + ":1080" + path
+// Forwards device files requests to the host orchestrators. A single proxy is
+// shared by all requests, which must already point to the right host.
+var deviceFilesProxy = &httputil.ReverseProxy{
+	Director: func(r *http.Request) {
+		if _, ok := r.Header["User-Agent"]; !ok {
+			// Prevent the default User-Agent value from being added, like the
+			// proxies returned by httputil.NewSingleHostReverseProxy do.
+			r.Header.Set("User-Agent", "")
+		}
+	},
+	Transport: hostTransport,
+}
+
+func (s *ForwardingSignalingServer) hostURL(addr string, path string, query string) string {
+	url := "http://" + addr + s.hostPort + path
 	if query != "" {
 		url += "?" + query
 	}
@@ -138,20 +174,20 @@ func POSTRequest(url string, msg interface{}, resObj interface{}, resErr *apiv1.
 		return -1, fmt.Errorf("Failed to parse JSON request: %w", err)
 	}
 	reqBody := bytes.NewBuffer(jsonBody)
-	res, err := http.Post(url, "application/json", reqBody)
+	res, err := hostClient.Post(url, "application/json", reqBody)
 	if err != nil {
 		return -1, fmt.Errorf("Failed to connecto to device host: %w", err)
 	}
-	defer res.Body.Close()
+	defer drainAndClose(res.Body)
 	return parseReply(res, resObj, resErr)
 }
 
 func GETRequest(url string, resObj interface{}, resErr *apiv1.ErrorMsg) (int, error) {
-	res, err := http.Get(url)
+	res, err := hostClient.Get(url)
 	if err != nil {
 		return -1, fmt.Errorf("Failed to connect to device host: %w", err)
 	}
-	defer res.Body.Close()
+	defer drainAndClose(res.Body)
 	return parseReply(res, resObj, resErr)
 }
 
@@ -169,10 +205,41 @@ func parseReply(res *http.Response, resObj interface{}, resErr *apiv1.ErrorMsg)
 	return res.StatusCode, nil
 }
 
-func shouldIntercept(path string) bool {
-	return path == "/js/server_connector.js"
+// Replies are a single JSON value, anything left after it is normally just a
+// trailing newline.
+const maxDrainBytes = 4 << 10
+
+// Consumes what is left of the body before closing it, otherwise the underlying
+// connection can't be reused for other requests. If there is more than a few
+// bytes left the connection is closed instead, so a misbehaving host can't keep
+// the request reading forever.
+func drainAndClose(body io.ReadCloser) {
+	io.CopyN(io.Discard, body, maxDrainBytes)
+	body.Close()
+}
+
+// Returns the location in the local filesystem of a device file that is served
+// by the orchestrator itself instead of the device.
+func interceptedFile(path string) (string, bool) {
+	if path == "/js/server_connector.js" {
+		return "intercept/js/server_connector.js", true
+	}
+	return "", false
 }
 
+// The page of the device's webrtc client. It loads the intercepted server
+// connector, which the browser can start fetching from the orchestrator while
+// the page itself is still being downloaded from the device.
+const deviceClientPage = "/client.html"
+
+// Relative to the client page's url. The server connector is a module script.
+var deviceClientPagePreloads = []string{"<js/server_connector.js>; rel=modulepreload"}
+
+// The intercepted files only change when the orchestrator is deployed, so
+// browsers can reuse them for a while without asking again. They are served to
+// authenticated users only, so shared caches must not store them.
+const interceptedFilesCacheControl = "private, max-age=300"
+
 const CONN_ID_SEPARATOR string = ":"
 
 func encodeConnId(connId string, deviceId string) string {
@@ -15,8 +15,15 @@
 package app
 
 import (
+	"net"
+	"net/http"
+	"net/http/httptest"
+	"net/url"
+	"os"
 	"strings"
 	"testing"
+
+	apiv1 "cloud-android-orchestration/api/v1"
 )
 
 var encodingTests = []struct {
@@ -54,3 +61,130 @@ func aux(connId string, devId string, t *testing.T) {
 		t.Errorf("Decoded device id doesn't match original: %s vs %s", dec.DevId, devId)
 	}
 }
+
+type testInstanceManager struct {
+	hostAddr string
+}
+
+func (m *testInstanceManager) GetHostAddr(_ string, _ string) (string, error) {
+	return m.hostAddr, nil
+}
+
+func (m *testInstanceManager) CreateHost(_ string, _ *apiv1.CreateHostRequest, _ UserInfo) (*apiv1.Operation, error) {
+	return nil, nil
+}
+
+func (m *testInstanceManager) ListHosts(_ string, _ UserInfo, _ *ListHostsRequest) (*apiv1.ListHostsResponse, error) {
+	return nil, nil
+}
+
+// Returns a signaling server forwarding requests to the given test server.
+func newTestSignalingServer(t *testing.T, ts *httptest.Server) *ForwardingSignalingServer {
+	u, err := url.Parse(ts.URL)
+	if err != nil {
+		t.Fatal(err)
+	}
+	host, port, err := net.SplitHostPort(u.Host)
+	if err != nil {
+		t.Fatal(err)
+	}
+	return &ForwardingSignalingServer{&testInstanceManager{host}, ":" + port}
+}
+
+func TestServeDeviceFilesForwardsToHost(t *testing.T) {
+	var usedURL string
+	var usedUserAgent []string
+	ts := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		usedURL = r.URL.String()
+		usedUserAgent = r.Header["User-Agent"]
+	}))
+	defer ts.Close()
+	s := newTestSignalingServer(t, ts)
+	r := httptest.NewRequest("GET", "http://abc.com/v1/zones/z/hosts/h/devices/dev1/files/js/app.js?foo=bar", nil)
+	w := httptest.NewRecorder()
+
+	err := s.ServeDeviceFiles("z", "h", DeviceFilesRequest{"dev1", "/js/app.js", w, r}, nil)
+
+	if err != nil {
+		t.Fatalf("unexpected error: %v", err)
+	}
+	if w.Code != http.StatusOK {
+		t.Errorf("expected <<%d>>, got %d", http.StatusOK, w.Code)
+	}
+	expected := "/devices/dev1/files/js/app.js?foo=bar"
+	if usedURL != expected {
+		t.Errorf("expected <<%q>>, got %q", expected, usedURL)
+	}
+	if usedUserAgent != nil {
+		t.Errorf("expected no User-Agent header, got %q", usedUserAgent)
+	}
+	if link := w.Header().Get("Link"); link != "" {
+		t.Errorf("expected no Link header, got %q", link)
+	}
+}
+
+func TestServeDeviceFilesKeepsUserAgent(t *testing.T) {
+	var usedUserAgent string
+	ts := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		usedUserAgent = r.UserAgent()
+	}))
+	defer ts.Close()
+	s := newTestSignalingServer(t, ts)
+	r := httptest.NewRequest("GET", "http://abc.com/v1/zones/z/hosts/h/devices/dev1/files/js/app.js", nil)
+	r.Header.Set("User-Agent", "foo")
+	w := httptest.NewRecorder()
+
+	s.ServeDeviceFiles("z", "h", DeviceFilesRequest{"dev1", "/js/app.js", w, r}, nil)
+
+	if usedUserAgent != "foo" {
+		t.Errorf("expected <<%q>>, got %q", "foo", usedUserAgent)
+	}
+}
+
+func TestServeDeviceFilesClientPagePreloads(t *testing.T) {
+	ts := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {}))
+	defer ts.Close()
+	s := newTestSignalingServer(t, ts)
+	r := httptest.NewRequest("GET", "http://abc.com/v1/zones/z/hosts/h/devices/dev1/files/client.html", nil)
+	w := httptest.NewRecorder()
+
+	s.ServeDeviceFiles("z", "h", DeviceFilesRequest{"dev1", "/client.html", w, r}, nil)
+
+	expected := "<js/server_connector.js>; rel=modulepreload"
+	if link := w.Header().Get("Link"); link != expected {
+		t.Errorf("expected <<%q>>, got %q", expected, link)
+	}
+}
+
+func TestServeDeviceFilesIntercepted(t *testing.T) {
+	requests := 0
+	ts := httptest.NewServer(http.HandlerFunc(func(w http.ResponseWriter, r *http.Request) {
+		requests++
+	}))
+	defer ts.Close()
+	s := newTestSignalingServer(t, ts)
+	// Intercepted files are looked up relative to the working directory, which
+	// is the repository root when the server runs.
+	wd, err := os.Getwd()
+	if err != nil {
+		t.Fatal(err)
+	}
+	if err := os.Chdir(".."); err != nil {
+		t.Fatal(err)
+	}
+	defer os.Chdir(wd)
+	r := httptest.NewRequest("GET", "http://abc.com/v1/zones/z/hosts/h/devices/dev1/files/js/server_connector.js", nil)
+	w := httptest.NewRecorder()
+
+	s.ServeDeviceFiles("z", "h", DeviceFilesRequest{"dev1", "/js/server_connector.js", w, r}, nil)
+
+	if w.Code != http.StatusOK {
+		t.Errorf("expected <<%d>>, got %d", http.StatusOK, w.Code)
+	}
+	if requests != 0 {
+		t.Errorf("expected <<%d>> requests to the host, got %d", 0, requests)
+	}
+	if cc := w.Header().Get("Cache-Control"); cc != interceptedFilesCacheControl {
+		t.Errorf("expected <<%q>>, got %q", interceptedFilesCacheControl, cc)
+	}
+}
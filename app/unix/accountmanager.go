@@ -26,8 +26,10 @@ import (
 type AccountManager struct{}
 
 func (m *AccountManager) Authenticate(fn app.AuthHTTPHandler) app.HTTPHandler {
+	// The user is the same for all requests, no need to look it up every time
+	user := &UserInfo{os.Getenv("USER")}
 	return func(w http.ResponseWriter, r *http.Request) error {
-		return fn(w, r, &UserInfo{})
+		return fn(w, r, user)
 	}
 }
 
@@ -36,8 +38,5 @@ type UserInfo struct {
 }
 
 func (i *UserInfo) Username() string {
-	if i.username == "" {
-		i.username = os.Getenv("USER")
-	}
 	return i.username
 }
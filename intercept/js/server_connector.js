@@ -180,16 +180,19 @@ class PollingConnector extends Connector {
       return;
     }
 
-    let currentPollDelay = 1000;
+    // The device starts the signaling handshake as soon as the connection is
+    // created, so the first poll happens right away.
+    let currentPollDelay = 0;
     let pollerRoutine = async () => {
       let messages = await this.#pollMessages();
 
       // Do exponential backoff on the polling up to 60 seconds
-      currentPollDelay = Math.min(60000, 2 * currentPollDelay);
+      currentPollDelay = Math.min(60000, Math.max(1000, 2 * currentPollDelay));
       for (const message of messages) {
         this.#onDeviceMsgCb(message.payload);
-        // There is at least one message, poll sooner
-        currentPollDelay = 1000;
+        // There is at least one message, more are likely to follow during the
+        // handshake so poll again without waiting
+        currentPollDelay = 0;
       }
       this.#pollerSchedule = setTimeout(pollerRoutine, currentPollDelay);
     };